@@ -1,6 +1,7 @@
 #!/usr/bin/env python3
 from __future__ import annotations
 
+import operator
 import os
 import sys
 from datetime import datetime, timedelta, timezone
@@ -28,10 +29,8 @@ def main() -> None:
     now_utc = datetime.now(timezone.utc)
     ends_before = now_utc + timedelta(days=3)
 
-    resource_filters = clist_to_ics.resolve_resource_filters(clist_to_ics.DEFAULT_RESOURCES)
-
     contests = clist_to_ics.fetch_contests_for_resources(
-        resource_filters=resource_filters,
+        resource_filters=clist_to_ics.DEFAULT_RESOURCE_FILTERS,
         username=username,
         api_key=api_key,
         starts_after=now_utc,
@@ -45,15 +44,16 @@ def main() -> None:
         return
 
     deduped = clist_to_ics.deduplicate_contests(contests)
-    deduped.sort(key=lambda contest: contest.start)
-
-    calendar_text = clist_to_ics.generate_ics(
-        contests=deduped,
-        calendar_name=CALENDAR_NAME,
-        product_id=PRODUCT_ID,
-    )
-
-    OUTPUT_PATH.write_text(calendar_text, encoding="utf-8")
+    deduped.sort(key=operator.attrgetter("start"))
+
+    with OUTPUT_PATH.open("w", encoding="utf-8") as handle:
+        handle.writelines(
+            clist_to_ics.generate_ics_lines(
+                contests=deduped,
+                calendar_name=CALENDAR_NAME,
+                product_id=PRODUCT_ID,
+            )
+        )
     print(f"Wrote {len(deduped)} contest(s) to {OUTPUT_PATH}")
 
 
@@ -1,13 +1,20 @@
 import json
-import subprocess
-import sys
+import re
+import shlex
 from datetime import datetime
 from getpass import getpass
 from pathlib import Path
 from typing import Dict, Optional
 
-CREDENTIALS_PATH = Path("clist_credentials.json")
+import clist_to_ics
 
+CREDENTIALS_PATH = Path("clist_credentials.json")
+# A deliberately loose superset of what datetime.fromisoformat accepts (Python 3.11 takes basic formats,
+# week dates, any date/time separator and compact offsets), used only to reject obvious junk cheaply.
+ISO_DATETIME_PATTERN = re.compile(
+    r"\d{4}-?(?:W\d{2}-?\d?|\d{2}-?\d{2}|\d{3})"
+    r"(?:.[\d:]*(?:[.,:][^+-]*)?(?:[^\d:.,+-]?(?:Z|[+-][\d:.,]*))?)?"
+)
 
 def main() -> None:
     print("CLIST contest calendar helper")
@@ -19,9 +26,7 @@ def main() -> None:
     include_ended = prompt_yes_no("Include contests that already ended?", default=False)
     output_path = input("Output .ics path [contests.ics]: ").strip() or "contests.ics"
 
-    cmd = [
-        sys.executable,
-        "clist_to_ics.py",
+    argv = [
         "--username",
         credentials["username"],
         "--api-key",
@@ -31,19 +36,17 @@ def main() -> None:
     ]
 
     if starts_after:
-        cmd.extend(["--starts-after", starts_after])
+        argv.extend(["--starts-after", starts_after])
     if ends_before:
-        cmd.extend(["--ends-before", ends_before])
+        argv.extend(["--ends-before", ends_before])
     if include_ended:
-        cmd.append("--include-ended")
+        argv.append("--include-ended")
 
     print("\nRunning:")
-    print(" ".join(cmd))
+    print(f"clist_to_ics.py {shlex.join(argv)}")
     print()
 
-    result = subprocess.run(cmd, check=False)
-    if result.returncode != 0:
-        sys.exit(result.returncode)
+    clist_to_ics.main(argv)
 
 
 def select_credentials() -> Dict[str, str]:
@@ -107,7 +110,7 @@ def load_saved_credentials() -> Optional[Dict[str, str]]:
 
 
 def save_credentials(data: Dict[str, str]) -> None:
-    CREDENTIALS_PATH.write_text(json.dumps(data, indent=2), encoding="utf-8")
+    CREDENTIALS_PATH.write_text(json.dumps(data, separators=(",", ":")), encoding="utf-8")
     print("Credentials saved.\n")
 
 
@@ -160,8 +163,12 @@ def prompt_datetime(message: str) -> Optional[str]:
 
 
 def is_valid_iso_datetime(value: str) -> bool:
+    candidate = canonicalize_iso(value)
+    # Input the pattern rejects can never parse; anything else is still decided by fromisoformat.
+    if not ISO_DATETIME_PATTERN.fullmatch(candidate):
+        return False
     try:
-        datetime.fromisoformat(canonicalize_iso(value))
+        datetime.fromisoformat(candidate)
     except ValueError:
         return False
     return True
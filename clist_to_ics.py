@@ -6,15 +6,32 @@ Fetch CLIST contests for selected competitive programming platforms and export t
 from __future__ import annotations
 
 import argparse
+import base64
 import datetime as dt
+import email.utils
+import functools
+import hashlib
+import http.client
 import json
+import operator
 import os
 import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
-from typing import Dict, Iterable, List, Optional, Sequence, Tuple
-from urllib import error, parse, request
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+from urllib import parse, request
+
+try:
+    from orjson import loads as json_loads
+except ImportError:
+    from json import loads as json_loads
 
 API_BASE = "https://clist.by/api/v2"
+API_URL = parse.urlsplit(API_BASE)
+UTC = dt.timezone.utc
 DEFAULT_RESOURCES = ["leetcode", "codeforces", "atcoder", "luogu", "nowcoder"]
 RESOURCE_ALIASES = {
     "leetcode": "leetcode.com",
@@ -29,7 +46,24 @@ RESOURCE_ALIASES = {
     "lg": "luogu.com.cn",
 }
 REQUEST_TIMEOUT = 30
+CACHE_DIR = Path("~/.cache/clist_helper").expanduser()
+DEFAULT_CACHE_TTL = 600
+CACHE_LOWER_BOUNDS = ("start__gte", "end__gte")
 PAGE_SIZE = 100
+MAX_PARALLEL_RESOURCES = 8
+MAX_PARALLEL_PAGES = 4
+MAX_RETRIES = 3
+RETRY_BACKOFF = 0.3
+MAX_RETRY_AFTER = 60
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+MAX_IDLE_CONNECTIONS = 16
+DISCONNECT_ERRORS = (http.client.RemoteDisconnected, ConnectionResetError, BrokenPipeError)
+
+ICS_ESCAPES = str.maketrans({"\\": "\\\\", ";": "\\;", ",": "\\,", "\n": "\\n"})
+
+# Keep-alive connections shared by all fetch threads; each one is used by a single request at a time.
+_idle_connections: List[http.client.HTTPSConnection] = []
+_connections_lock = threading.Lock()
 
 
 class ClistApiError(Exception):
@@ -38,6 +72,9 @@ class ClistApiError(Exception):
 
 @dataclass(frozen=True)
 class Contest:
+    # Declared by hand rather than via dataclass(slots=True), which needs Python 3.10+.
+    __slots__ = ("contest_id", "title", "start", "end", "url", "resource_id", "resource_name")
+
     contest_id: int
     title: str
     start: dt.datetime
@@ -46,6 +83,14 @@ class Contest:
     resource_id: int
     resource_name: str
 
+    # The frozen __setattr__ rejects slot restoration, so copy/pickle go through object.__setattr__.
+    def __getstate__(self) -> Tuple[object, ...]:
+        return tuple(getattr(self, name) for name in self.__slots__)
+
+    def __setstate__(self, state: Tuple[object, ...]) -> None:
+        for name, value in zip(self.__slots__, state):
+            object.__setattr__(self, name, value)
+
     @property
     def duration(self) -> dt.timedelta:
         return self.end - self.start
@@ -65,8 +110,8 @@ class Contest:
         return "\n".join(lines)
 
 
-def main() -> None:
-    args = build_parser().parse_args()
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    args = build_parser().parse_args(argv)
 
     username = args.username or os.environ.get("CLIST_API_USERNAME")
     api_key = args.api_key or os.environ.get("CLIST_API_KEY")
@@ -74,44 +119,51 @@ def main() -> None:
     if not username or not api_key:
         sys.exit("CLIST credentials are required. Provide --username/--api-key or set CLIST_API_USERNAME/CLIST_API_KEY.")
 
-    try:
-        resource_filters = resolve_resource_filters(args.resources)
-    except ClistApiError as exc:
-        sys.exit(str(exc))
+    if args.resources is DEFAULT_RESOURCES:
+        resource_filters: Sequence[Tuple[str, object]] = DEFAULT_RESOURCE_FILTERS
+    else:
+        try:
+            resource_filters = resolve_resource_filters(args.resources)
+        except ClistApiError as exc:
+            sys.exit(str(exc))
 
     starts_after = parse_cli_datetime(args.starts_after) if args.starts_after else None
     ends_before = parse_cli_datetime(args.ends_before) if args.ends_before else None
     if not starts_after and not args.include_ended:
-        starts_after = dt.datetime.now(dt.timezone.utc)
-
-    contests = fetch_contests_for_resources(
-        resource_filters=resource_filters,
-        username=username,
-        api_key=api_key,
-        starts_after=starts_after,
-        ends_before=ends_before,
-        per_resource_limit=args.per_resource_limit,
-        include_ended=args.include_ended,
-    )
+        starts_after = dt.datetime.now(UTC)
+
+    try:
+        contests = fetch_contests_for_resources(
+            resource_filters=resource_filters,
+            username=username,
+            api_key=api_key,
+            starts_after=starts_after,
+            ends_before=ends_before,
+            per_resource_limit=args.per_resource_limit,
+            include_ended=args.include_ended,
+            cache_ttl=args.cache_ttl,
+        )
+    except ClistApiError as exc:
+        sys.exit(str(exc))
 
     if not contests:
         sys.exit("No contests retrieved. Adjust filters or timeframe.")
 
     deduped = deduplicate_contests(contests)
-    deduped.sort(key=lambda contest: contest.start)
+    deduped.sort(key=operator.attrgetter("start"))
 
     if args.max_contests and len(deduped) > args.max_contests:
         deduped = deduped[: args.max_contests]
 
-    calendar_text = generate_ics(
-        contests=deduped,
-        calendar_name=args.calendar_name,
-        product_id=args.product_id,
-    )
-
     output_path = os.fspath(args.output)
     with open(output_path, "w", encoding="utf-8") as handle:
-        handle.write(calendar_text)
+        handle.writelines(
+            generate_ics_lines(
+                contests=deduped,
+                calendar_name=args.calendar_name,
+                product_id=args.product_id,
+            )
+        )
 
     print(f"Wrote {len(deduped)} contest(s) to {output_path}")
 
@@ -177,12 +229,17 @@ def build_parser() -> argparse.ArgumentParser:
         default="contests.ics",
         help="Output .ics file path.",
     )
+    parser.add_argument(
+        "--cache-ttl",
+        type=int,
+        default=DEFAULT_CACHE_TTL,
+        help=f"Seconds to reuse cached CLIST API responses stored in {CACHE_DIR}. 0 disables the cache.",
+    )
     return parser
 
 
 def resolve_resource_filters(resources: Sequence[str]) -> List[Tuple[str, object]]:
     resolved: List[Tuple[str, object]] = []
-    seen: set[Tuple[str, object]] = set()
 
     for raw in resources:
         value = raw.strip()
@@ -202,14 +259,15 @@ def resolve_resource_filters(resources: Sequence[str]) -> List[Tuple[str, object
                 "a host like codeforces.com, or a numeric resource ID."
             )
 
-        if key_val not in seen:
-            resolved.append(key_val)
-            seen.add(key_val)
+        resolved.append(key_val)
 
     if not resolved:
         raise ClistApiError("No valid resources resolved. Check the provided resource filters.")
 
-    return resolved
+    return list(dict.fromkeys(resolved))
+
+
+DEFAULT_RESOURCE_FILTERS = tuple(resolve_resource_filters(DEFAULT_RESOURCES))
 
 
 def fetch_contests_for_resources(
@@ -220,11 +278,20 @@ def fetch_contests_for_resources(
     ends_before: Optional[dt.datetime],
     per_resource_limit: int,
     include_ended: bool,
+    cache_ttl: int = 0,
 ) -> List[Contest]:
     contests: List[Contest] = []
-    for filter_key, filter_value in resource_filters:
-        contests.extend(
-            fetch_contests_for_resource(
+    if not resource_filters:
+        return contests
+
+    # Share one "now" so every resource and page filters against the same end__gte.
+    now = dt.datetime.now(UTC)
+    # Each resource is an independent chain of HTTP requests, so fetch them concurrently.
+    workers = min(MAX_PARALLEL_RESOURCES, len(resource_filters))
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = [
+            executor.submit(
+                fetch_contests_for_resource,
                 filter_key=filter_key,
                 filter_value=filter_value,
                 username=username,
@@ -233,8 +300,24 @@ def fetch_contests_for_resources(
                 ends_before=ends_before,
                 per_resource_limit=per_resource_limit,
                 include_ended=include_ended,
+                cache_ttl=cache_ttl,
+                now=now,
             )
-        )
+            for filter_key, filter_value in resource_filters
+        ]
+        failures: List[ClistApiError] = []
+        for (filter_key, filter_value), future in zip(resource_filters, futures):
+            try:
+                contests.extend(future.result())
+            except ClistApiError as exc:
+                print(f"Skipping {filter_key}={filter_value} due to API error: {exc}", file=sys.stderr)
+                failures.append(exc)
+
+    # A partial outage still yields a calendar, but if nothing could be fetched the caller must know.
+    if len(failures) == len(resource_filters):
+        if len(failures) == 1:
+            raise failures[0]
+        raise ClistApiError(f"All {len(failures)} resources failed; last error: {failures[-1]}") from failures[-1]
     return contests
 
 
@@ -247,50 +330,110 @@ def fetch_contests_for_resource(
     ends_before: Optional[dt.datetime],
     per_resource_limit: int,
     include_ended: bool,
+    cache_ttl: int = 0,
+    now: Optional[dt.datetime] = None,
 ) -> List[Contest]:
-    fetched: List[Contest] = []
-    offset = 0
-
-    while True:
-        remaining = per_resource_limit - len(fetched) if per_resource_limit else PAGE_SIZE
-        if per_resource_limit and remaining <= 0:
-            break
-
-        limit = PAGE_SIZE if not per_resource_limit else min(PAGE_SIZE, remaining)
-        params: Dict[str, object] = {
-            filter_key: filter_value,
-            "order_by": "start",
-            "offset": offset,
-            "limit": limit,
-        }
-        if starts_after:
-            params["start__gte"] = to_api_time(starts_after)
-        if ends_before:
-            params["start__lte"] = to_api_time(ends_before)
-        if not include_ended:
-            params["end__gte"] = to_api_time(dt.datetime.now(dt.timezone.utc))
-
-        data = api_get("/contest/", params, username, api_key)
+    now_utc = ensure_utc(now) if now else dt.datetime.now(UTC)
+    query: Dict[str, object] = {
+        filter_key: filter_value,
+        "order_by": "start",
+        "total_count": "true",
+    }
+    if starts_after:
+        query["start__gte"] = to_api_time(starts_after)
+    if ends_before:
+        query["start__lte"] = to_api_time(ends_before)
+    if not include_ended:
+        query["end__gte"] = to_api_time(now_utc)
+
+    def in_bounds(contest: Contest) -> bool:
+        if starts_after and contest.start < ensure_utc(starts_after):
+            return False
+        if ends_before and contest.start > ensure_utc(ends_before):
+            return False
+        return include_ended or contest.end >= now_utc
+
+    def limited(contests: List[Contest]) -> List[Contest]:
+        return contests[:per_resource_limit] if per_resource_limit else contests
+
+    cache_key = contest_cache_key(query, per_resource_limit, cache_ttl) if cache_ttl > 0 else None
+    if cache_key:
+        cached = read_cached_payloads(cache_key, query, cache_ttl)
+        if cached is not None:
+            # The cached query may have used slightly earlier lower bounds, so re-apply the real ones.
+            cached_payloads, cached_more = cached
+            contests = [
+                contest
+                for contest in map(try_parse_contest, cached_payloads)
+                if contest is not None and in_bounds(contest)
+            ]
+            if not cached_more or (per_resource_limit and len(contests) >= per_resource_limit):
+                return limited(contests)
+
+    def page_limit(offset: int) -> int:
+        return PAGE_SIZE if not per_resource_limit else min(PAGE_SIZE, per_resource_limit - offset)
+
+    def fetch_page(offset: int, limit: int) -> Dict[str, object]:
+        return api_get("/contest/", {**query, "offset": offset, "limit": limit}, username, api_key)
+
+    def has_more(data: Dict[str, object], limit: int, offset: int) -> bool:
+        # A short (or empty) page means the server has nothing more to return.
+        if len(data.get("objects", [])) < limit:
+            return False
+        if isinstance(total_count, int):
+            return offset < total_count
+        return bool(data.get("meta", {}).get("next"))
+
+    limit = page_limit(0)
+    data = fetch_page(0, limit)
+    pages = [data.get("objects", [])]
+    offset = len(pages[0])
+    total_count = data.get("meta", {}).get("total_count")
+    more = has_more(data, limit, offset)
+
+    if more and isinstance(total_count, int):
+        # The first page tells us how many contests match, so the remaining pages can be requested at once.
+        wanted = min(total_count, per_resource_limit) if per_resource_limit else total_count
+        offsets = range(offset, wanted, PAGE_SIZE)
+        if offsets:
+            limits = [page_limit(page_offset) for page_offset in offsets]
+            with ThreadPoolExecutor(max_workers=min(MAX_PARALLEL_PAGES, len(offsets))) as executor:
+                responses = list(executor.map(fetch_page, offsets, limits))
+            pages.extend(response.get("objects", []) for response in responses)
+            offset += sum(len(objects) for objects in pages[1:])
+            more = has_more(responses[-1], limits[-1], offset)
+    else:
+        while more and (not per_resource_limit or offset < per_resource_limit):
+            limit = page_limit(offset)
+            data = fetch_page(offset, limit)
+            pages.append(data.get("objects", []))
+            offset += len(pages[-1])
+            more = has_more(data, limit, offset)
+
+    payloads = [payload for objects in pages for payload in objects]
+    fetched = [contest for contest in map(try_parse_contest, payloads) if contest is not None]
+
+    # Payloads that failed to parse leave the resource short of its limit; top it up from later pages.
+    while per_resource_limit and len(fetched) < per_resource_limit and more:
+        limit = min(PAGE_SIZE, per_resource_limit - len(fetched))
+        data = fetch_page(offset, limit)
         objects = data.get("objects", [])
-        if not objects:
-            break
-
-        for payload in objects:
-            try:
-                contest = parse_contest(payload)
-            except ValueError as exc:
-                print(f"Skipping contest due to parse error: {exc}", file=sys.stderr)
-                continue
-            fetched.append(contest)
-            if per_resource_limit and len(fetched) >= per_resource_limit:
-                return fetched
-
         offset += len(objects)
+        more = has_more(data, limit, offset)
+        payloads.extend(objects)
+        fetched.extend(contest for contest in map(try_parse_contest, objects) if contest is not None)
+
+    if cache_key:
+        write_cached_payloads(cache_key, query, payloads, more, cache_ttl)
+    return limited(fetched)
 
-        if not data.get("meta", {}).get("next"):
-            break
 
-    return fetched
+def try_parse_contest(payload: Dict[str, object]) -> Optional[Contest]:
+    try:
+        return parse_contest(payload)
+    except ValueError as exc:
+        print(f"Skipping contest due to parse error: {exc}", file=sys.stderr)
+        return None
 
 
 def parse_contest(payload: Dict[str, object]) -> Contest:
@@ -341,10 +484,10 @@ def parse_iso_datetime(value: str) -> dt.datetime:
             parsed = dt.datetime.strptime(value, "%Y-%m-%dT%H:%M:%S")
         except ValueError:
             raise ValueError(f"Unsupported datetime format: {value}") from exc
-        parsed = parsed.replace(tzinfo=dt.timezone.utc)
+        parsed = parsed.replace(tzinfo=UTC)
     if parsed.tzinfo is None:
-        parsed = parsed.replace(tzinfo=dt.timezone.utc)
-    return parsed.astimezone(dt.timezone.utc)
+        parsed = parsed.replace(tzinfo=UTC)
+    return parsed.astimezone(UTC)
 
 
 def parse_cli_datetime(value: str) -> dt.datetime:
@@ -358,90 +501,244 @@ def to_api_time(value: dt.datetime) -> str:
 
 def ensure_utc(value: dt.datetime) -> dt.datetime:
     if value.tzinfo is None:
-        return value.replace(tzinfo=dt.timezone.utc)
-    return value.astimezone(dt.timezone.utc)
+        return value.replace(tzinfo=UTC)
+    return value.astimezone(UTC)
 
 
-def api_get(path: str, params: Dict[str, object], username: str, api_key: str) -> Dict[str, object]:
+def api_get(
+    path: str,
+    params: Dict[str, object],
+    username: str,
+    api_key: str,
+) -> Dict[str, object]:
     query = parse.urlencode(params, doseq=True)
+    target = f"{API_URL.path}{path}?{query}" if query else f"{API_URL.path}{path}"
     url = f"{API_BASE}{path}?{query}" if query else f"{API_BASE}{path}"
 
-    req = request.Request(url)
-    req.add_header("Authorization", f"ApiKey {username}:{api_key}")
-    req.add_header("Accept", "application/json")
+    headers = {
+        "Authorization": f"ApiKey {username}:{api_key}",
+        "Accept": "application/json",
+    }
 
-    try:
-        with request.urlopen(req, timeout=REQUEST_TIMEOUT) as response:
+    attempt = 0
+    fresh = False
+    while True:
+        connection = None if fresh else take_idle_connection()
+        reused = connection is not None
+        if connection is None:
+            connection = open_connection()
+        try:
+            connection.request("GET", target, headers=headers)
+            response = connection.getresponse()
             payload = response.read()
-    except error.HTTPError as exc:
-        detail = exc.read().decode("utf-8", errors="ignore")
-        raise ClistApiError(f"CLIST API error ({exc.code}) for {url}: {detail}") from exc
-    except error.URLError as exc:
-        raise ClistApiError(f"Failed to reach CLIST API: {exc.reason}") from exc
+        except DISCONNECT_ERRORS as exc:
+            connection.close()
+            if not reused:
+                raise ClistApiError(f"Failed to reach CLIST API: {exc}") from exc
+            # The server dropped an idle keep-alive connection; resend at once on a new one.
+            fresh = True
+            continue
+        except (http.client.HTTPException, OSError) as exc:
+            # Timeouts, TLS failures and refused connections will not fix themselves on retry.
+            connection.close()
+            raise ClistApiError(f"Failed to reach CLIST API: {exc}") from exc
+
+        release_connection(connection)
+        fresh = False
+        if response.status not in RETRY_STATUSES or attempt >= MAX_RETRIES:
+            break
+        time.sleep(max(RETRY_BACKOFF * (2**attempt), retry_after_seconds(response.getheader("Retry-After"))))
+        attempt += 1
+
+    if response.status >= 400:
+        detail = payload.decode("utf-8", errors="ignore")
+        raise ClistApiError(f"CLIST API error ({response.status}) for {url}: {detail}")
 
     try:
-        return json.loads(payload.decode("utf-8"))
-    except json.JSONDecodeError as exc:
+        return json_loads(payload)
+    except ValueError as exc:
         raise ClistApiError("CLIST API response was not valid JSON") from exc
 
 
+def retry_after_seconds(header: Optional[str]) -> float:
+    # Retry-After is either a number of seconds or an HTTP date.
+    if not header:
+        return 0.0
+    header = header.strip()
+    if header.isdigit():
+        seconds = float(header)
+    else:
+        try:
+            retry_at = email.utils.parsedate_to_datetime(header)
+        except (TypeError, ValueError):
+            return 0.0
+        seconds = (ensure_utc(retry_at) - dt.datetime.now(UTC)).total_seconds()
+    return min(max(seconds, 0.0), MAX_RETRY_AFTER)
+
+
+def take_idle_connection() -> Optional[http.client.HTTPSConnection]:
+    with _connections_lock:
+        return _idle_connections.pop() if _idle_connections else None
+
+
+def open_connection() -> http.client.HTTPSConnection:
+    # Honour HTTPS_PROXY/NO_PROXY the way urllib's default ProxyHandler does, tunnelling with CONNECT.
+    proxy = request.getproxies().get("https")
+    if not proxy or request.proxy_bypass(API_URL.hostname):
+        return http.client.HTTPSConnection(API_URL.hostname, API_URL.port, timeout=REQUEST_TIMEOUT)
+
+    proxy_url = parse.urlsplit(proxy if "://" in proxy else f"http://{proxy}")
+    tunnel_headers: Dict[str, str] = {}
+    if proxy_url.username:
+        credentials = f"{parse.unquote(proxy_url.username)}:{parse.unquote(proxy_url.password or '')}"
+        tunnel_headers["Proxy-Authorization"] = "Basic " + base64.b64encode(credentials.encode("utf-8")).decode("ascii")
+    connection = http.client.HTTPSConnection(proxy_url.hostname, proxy_url.port or 80, timeout=REQUEST_TIMEOUT)
+    connection.set_tunnel(API_URL.hostname, API_URL.port, headers=tunnel_headers)
+    return connection
+
+
+def release_connection(connection: http.client.HTTPSConnection) -> None:
+    with _connections_lock:
+        if len(_idle_connections) < MAX_IDLE_CONNECTIONS:
+            _idle_connections.append(connection)
+            return
+    connection.close()
+
+
+def contest_cache_key(query: Dict[str, object], per_resource_limit: int, cache_ttl: int) -> str:
+    # Lower bounds derived from "now" change every run; key them by cache window so reruns can hit.
+    key_params = dict(query, per_resource_limit=per_resource_limit)
+    for name in CACHE_LOWER_BOUNDS:
+        if name in key_params:
+            bound = parse_iso_datetime(str(key_params[name]))
+            key_params[name] = int(bound.timestamp()) // cache_ttl
+    key = parse.urlencode(sorted(key_params.items()))
+    return hashlib.sha256(key.encode("utf-8")).hexdigest()
+
+
+def read_cached_payloads(
+    cache_key: str,
+    query: Dict[str, object],
+    cache_ttl: int,
+) -> Optional[Tuple[List[Dict[str, object]], bool]]:
+    try:
+        entry = json_loads((CACHE_DIR / f"{cache_key}.json").read_bytes())
+    except (OSError, ValueError):
+        return None
+
+    if not isinstance(entry, dict):
+        return None
+    fetched_at = entry.get("fetched_at")
+    cached_query = entry.get("query")
+    payloads = entry.get("payloads")
+    if not isinstance(fetched_at, (int, float)) or not isinstance(cached_query, dict) or not isinstance(payloads, list):
+        return None
+    if time.time() - fetched_at > cache_ttl:
+        return None
+
+    # Only reuse a cached result that is a superset of this query: its lower bounds must not be later.
+    for name in CACHE_LOWER_BOUNDS:
+        if name not in query:
+            continue
+        try:
+            if parse_iso_datetime(str(cached_query.get(name))) > parse_iso_datetime(str(query[name])):
+                return None
+        except ValueError:
+            return None
+    return payloads, bool(entry.get("more"))
+
+
+def write_cached_payloads(
+    cache_key: str,
+    query: Dict[str, object],
+    payloads: List[Dict[str, object]],
+    more: bool,
+    cache_ttl: int,
+) -> None:
+    path = CACHE_DIR / f"{cache_key}.json"
+    temp_path = path.with_suffix(f".{threading.get_ident()}.tmp")
+    entry = {"fetched_at": time.time(), "query": query, "payloads": payloads, "more": more}
+    try:
+        CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        prune_cache(cache_ttl)
+        temp_path.write_text(json.dumps(entry), encoding="utf-8")
+        os.replace(temp_path, path)
+    except OSError as exc:
+        print(f"Could not write CLIST response cache: {exc}", file=sys.stderr)
+
+
+def prune_cache(cache_ttl: int) -> None:
+    cutoff = time.time() - cache_ttl
+    for path in CACHE_DIR.iterdir():
+        if path.suffix not in (".json", ".tmp"):
+            continue
+        try:
+            if path.stat().st_mtime < cutoff:
+                path.unlink()
+        except OSError:
+            pass
+
+
 def deduplicate_contests(contests: Iterable[Contest]) -> List[Contest]:
-    by_id: Dict[int, Contest] = {}
+    seen: set[int] = set()
+    unique: List[Contest] = []
     for contest in contests:
-        by_id[contest.contest_id] = contest
-    return list(by_id.values())
+        contest_id = contest.contest_id
+        if contest_id not in seen:
+            seen.add(contest_id)
+            unique.append(contest)
+    return unique
 
 
 def generate_ics(contests: Sequence[Contest], calendar_name: str, product_id: str) -> str:
-    now_utc = dt.datetime.now(dt.timezone.utc)
-    lines: List[str] = [
-        "BEGIN:VCALENDAR",
-        fold_ics_line(f"PRODID:{product_id}"),
-        "VERSION:2.0",
-        "CALSCALE:GREGORIAN",
-        "METHOD:PUBLISH",
-    ]
+    return "".join(generate_ics_lines(contests, calendar_name, product_id))
+
+
+def generate_ics_lines(contests: Iterable[Contest], calendar_name: str, product_id: str) -> Iterator[str]:
+    now_utc = dt.datetime.now(UTC)
+    yield "BEGIN:VCALENDAR\r\n"
+    yield fold_ics_line(f"PRODID:{product_id}") + "\r\n"
+    yield "VERSION:2.0\r\n"
+    yield "CALSCALE:GREGORIAN\r\n"
+    yield "METHOD:PUBLISH\r\n"
     if calendar_name:
-        lines.append(fold_ics_line(f"X-WR-CALNAME:{escape_ics_text(calendar_name)}"))
+        yield fold_ics_line(f"X-WR-CALNAME:{escape_ics_text(calendar_name)}") + "\r\n"
 
+    # DTSTAMP is identical for every event, so format it once.
+    dtstamp_line = fold_ics_line(f"DTSTAMP:{format_ics_datetime(now_utc)}")
     for contest in contests:
-        lines.append("BEGIN:VEVENT")
-        lines.append(fold_ics_line(f"UID:{contest.contest_id}@clist.by"))
-        lines.append(fold_ics_line(f"DTSTAMP:{format_ics_datetime(now_utc)}"))
-        lines.append(fold_ics_line(f"DTSTART:{format_ics_datetime(contest.start)}"))
-        lines.append(fold_ics_line(f"DTEND:{format_ics_datetime(contest.end)}"))
-        lines.append(fold_ics_line(f"SUMMARY:{escape_ics_text(contest.summary())}"))
-        lines.append(fold_ics_line(f"DESCRIPTION:{escape_ics_text(contest.description())}"))
+        event = [
+            "BEGIN:VEVENT",
+            fold_ics_line(f"UID:{contest.contest_id}@clist.by"),
+            dtstamp_line,
+            fold_ics_line(f"DTSTART:{format_ics_datetime(contest.start)}"),
+            fold_ics_line(f"DTEND:{format_ics_datetime(contest.end)}"),
+            fold_ics_line(f"SUMMARY:{escape_ics_text(contest.summary())}"),
+            fold_ics_line(f"DESCRIPTION:{escape_ics_text(contest.description())}"),
+        ]
         if contest.url:
-            lines.append(fold_ics_line(f"URL:{escape_ics_text(contest.url)}"))
-        lines.append(fold_ics_line(f"CATEGORIES:{escape_ics_text(contest.resource_name)}"))
-        lines.append("END:VEVENT")
+            event.append(fold_ics_line(f"URL:{escape_ics_text(contest.url)}"))
+        event.append(fold_ics_line(f"CATEGORIES:{escape_ics_text(contest.resource_name)}"))
+        event.append("END:VEVENT\r\n")
+        yield "\r\n".join(event)
 
-    lines.append("END:VCALENDAR")
-    return "\r\n".join(lines) + "\r\n"
+    yield "END:VCALENDAR\r\n"
 
 
 def format_ics_datetime(value: dt.datetime) -> str:
     return ensure_utc(value).strftime("%Y%m%dT%H%M%SZ")
 
 
+@functools.lru_cache(maxsize=512)
 def escape_ics_text(value: str) -> str:
-    return (
-        value.replace("\\", "\\\\")
-        .replace(";", "\\;")
-        .replace(",", "\\,")
-        .replace("\n", "\\n")
-    )
+    return value.translate(ICS_ESCAPES)
 
 
 def fold_ics_line(line: str) -> str:
     if len(line) <= 75:
         return line
     segments = [line[:75]]
-    remainder = line[75:]
-    while remainder:
-        segments.append(" " + remainder[:74])
-        remainder = remainder[74:]
+    segments.extend(" " + line[index : index + 74] for index in range(75, len(line), 74))
     return "\r\n".join(segments)
 
 
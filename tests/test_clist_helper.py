@@ -0,0 +1,49 @@
+import unittest
+from datetime import datetime
+
+import clist_helper
+
+
+def parses(value: str) -> bool:
+    try:
+        datetime.fromisoformat(clist_helper.canonicalize_iso(value))
+    except ValueError:
+        return False
+    return True
+
+
+class IsValidIsoDatetimeTests(unittest.TestCase):
+    def test_accepts_iso_formats(self) -> None:
+        for value in (
+            "2025-01-01",
+            "2025-01-01T00:00:00Z",
+            "2025-01-01T00:00:00+00:00",
+            "2025-01-01 10:00",
+            "2025-01-01T00:00:00.123456+05:30",
+        ):
+            with self.subTest(value=value):
+                self.assertTrue(clist_helper.is_valid_iso_datetime(value))
+
+    def test_matches_fromisoformat_for_extended_formats(self) -> None:
+        # Which of these parse depends on the Python version; the helper must agree with fromisoformat.
+        for value in (
+            "2025-01-01T12:00:00+0800",
+            "2025-01-01T12:00:00-08",
+            "2025-01-01T12:00:00+05:30:00",
+            "2025-01-01T12:00:00,5",
+            "20250101",
+            "2025-01-01T1200",
+            "2025-01-01x12:00",
+            "2025-W01-1",
+        ):
+            with self.subTest(value=value):
+                self.assertEqual(clist_helper.is_valid_iso_datetime(value), parses(value))
+
+    def test_rejects_invalid_input(self) -> None:
+        for value in ("", "abc", "tomorrow", "2025/01/01", "2025-13-01T00:00:00", "2025-01-01T25:00:00"):
+            with self.subTest(value=value):
+                self.assertFalse(clist_helper.is_valid_iso_datetime(value))
+
+
+if __name__ == "__main__":
+    unittest.main()
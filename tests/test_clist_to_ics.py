@@ -0,0 +1,316 @@
+import copy
+import datetime as dt
+import email.utils
+import http.client
+import os
+import pickle
+import socket
+import ssl
+import tempfile
+import time
+import unittest
+from pathlib import Path
+from typing import Optional
+from unittest import mock
+
+import clist_to_ics
+
+
+class ContestTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.contest = clist_to_ics.Contest(
+            contest_id=1,
+            title="Round 1",
+            start=dt.datetime(2025, 1, 1, 12, tzinfo=dt.timezone.utc),
+            end=dt.datetime(2025, 1, 1, 14, tzinfo=dt.timezone.utc),
+            url="https://codeforces.com/contest/1",
+            resource_id=1,
+            resource_name="codeforces.com",
+        )
+
+    def test_copy_round_trips(self) -> None:
+        self.assertEqual(copy.copy(self.contest), self.contest)
+        self.assertEqual(copy.deepcopy(self.contest), self.contest)
+
+    def test_pickle_round_trips(self) -> None:
+        self.assertEqual(pickle.loads(pickle.dumps(self.contest)), self.contest)
+
+
+class ParseIsoDatetimeTests(unittest.TestCase):
+    def test_parses_clist_and_cli_formats(self) -> None:
+        expected = dt.datetime(2025, 1, 1, 12, tzinfo=dt.timezone.utc)
+        for value in ("2025-01-01T12:00:00", "2025-01-01T12:00:00Z", "2025-01-01T20:00:00+08:00"):
+            with self.subTest(value=value):
+                self.assertEqual(clist_to_ics.parse_iso_datetime(value), expected)
+
+    def test_rejects_malformed_timestamps(self) -> None:
+        for value in (
+            "2025/01/01T12:00:00",
+            "2025-01-01T12-00-00",
+            "2025-01-01T 1:00:00",
+            "+025-01-01T12:00:00",
+            "2_25-01-01T00:00:00",
+        ):
+            with self.subTest(value=value):
+                with self.assertRaises(ValueError):
+                    clist_to_ics.parse_iso_datetime(value)
+
+
+class FakeContestApi:
+    def __init__(self, total: int, *, report_total: bool = True, bad_ids: frozenset = frozenset()) -> None:
+        self.payloads = [
+            {
+                "id": index,
+                "event": f"Contest {index}",
+                "start": "broken" if index in bad_ids else "2025-01-01T12:00:00",
+                "end": f"2025-01-01T13:{index % 60:02d}:00",
+                "resource": "codeforces.com",
+            }
+            for index in range(total)
+        ]
+        self.report_total = report_total
+        self.requests: list = []
+        self.queries: list = []
+
+    def __call__(self, path, params, username, api_key):
+        offset, limit = params["offset"], params["limit"]
+        self.requests.append((offset, limit))
+        self.queries.append(params)
+        payloads = self.payloads
+        if "end__gte" in params:
+            end_after = clist_to_ics.parse_iso_datetime(params["end__gte"])
+            payloads = [p for p in payloads if clist_to_ics.parse_iso_datetime(p["end"]) >= end_after]
+        meta = {"next": "more" if offset + limit < len(payloads) else None}
+        if self.report_total:
+            meta["total_count"] = len(payloads)
+        return {"meta": meta, "objects": payloads[offset : offset + limit]}
+
+
+class FetchContestsForResourceTests(unittest.TestCase):
+    def fetch(self, api: FakeContestApi, per_resource_limit: int) -> list:
+        with mock.patch.object(clist_to_ics, "api_get", api), mock.patch("sys.stderr"):
+            return clist_to_ics.fetch_contests_for_resource(
+                filter_key="resource",
+                filter_value="codeforces.com",
+                username="user",
+                api_key="key",
+                starts_after=None,
+                ends_before=None,
+                per_resource_limit=per_resource_limit,
+                include_ended=True,
+            )
+
+    def ids(self, contests: list) -> list:
+        return [contest.contest_id for contest in contests]
+
+    def test_fetches_every_page_using_total_count(self) -> None:
+        api = FakeContestApi(230)
+        self.assertEqual(self.ids(self.fetch(api, 0)), list(range(230)))
+        self.assertEqual(sorted(api.requests), [(0, 100), (100, 100), (200, 100)])
+
+    def test_follows_meta_next_without_total_count(self) -> None:
+        api = FakeContestApi(230, report_total=False)
+        self.assertEqual(self.ids(self.fetch(api, 0)), list(range(230)))
+        self.assertEqual(api.requests, [(0, 100), (100, 100), (200, 100)])
+
+    def test_stops_after_short_first_page(self) -> None:
+        api = FakeContestApi(30)
+        self.assertEqual(len(self.fetch(api, 0)), 30)
+        self.assertEqual(api.requests, [(0, 100)])
+
+    def test_truncates_to_per_resource_limit(self) -> None:
+        for report_total in (True, False):
+            with self.subTest(report_total=report_total):
+                api = FakeContestApi(230, report_total=report_total)
+                self.assertEqual(self.ids(self.fetch(api, 150)), list(range(150)))
+                self.assertEqual(sorted(api.requests), [(0, 100), (100, 50)])
+
+    def test_tops_up_after_parse_failures(self) -> None:
+        for report_total in (True, False):
+            with self.subTest(report_total=report_total):
+                api = FakeContestApi(200, report_total=report_total, bad_ids=frozenset({5}))
+                contests = self.fetch(api, 150)
+                self.assertEqual(self.ids(contests), [index for index in range(151) if index != 5])
+
+    def test_parse_failures_at_the_end_return_what_exists(self) -> None:
+        api = FakeContestApi(120, bad_ids=frozenset({0, 1}))
+        self.assertEqual(self.ids(self.fetch(api, 150)), list(range(2, 120)))
+
+
+class ContestCacheTests(unittest.TestCase):
+    def setUp(self) -> None:
+        temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(temp_dir.cleanup)
+        self.cache_dir = Path(temp_dir.name)
+        patcher = mock.patch.object(clist_to_ics, "CACHE_DIR", self.cache_dir)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def fetch(self, api: FakeContestApi, now: dt.datetime, cache_ttl: int = 600) -> list:
+        with mock.patch.object(clist_to_ics, "api_get", api), mock.patch("sys.stderr"):
+            contests = clist_to_ics.fetch_contests_for_resource(
+                filter_key="resource",
+                filter_value="codeforces.com",
+                username="user",
+                api_key="key",
+                starts_after=None,
+                ends_before=None,
+                per_resource_limit=0,
+                include_ended=False,
+                cache_ttl=cache_ttl,
+                now=now,
+            )
+        return [contest.contest_id for contest in contests]
+
+    def at(self, minute: int, second: int = 0) -> dt.datetime:
+        return dt.datetime(2025, 1, 1, 13, minute, second, tzinfo=dt.timezone.utc)
+
+    def test_sends_the_real_now(self) -> None:
+        api = FakeContestApi(60)
+        self.fetch(api, self.at(7, 30))
+        self.assertEqual(api.queries[0]["end__gte"], "2025-01-01T13:07:30Z")
+
+    def test_reuses_cached_result_filtered_by_real_bounds(self) -> None:
+        api = FakeContestApi(60)
+        self.assertEqual(self.fetch(api, self.at(1)), list(range(1, 60)))
+        self.assertEqual(self.fetch(api, self.at(5)), list(range(5, 60)))
+        self.assertEqual(len(api.requests), 1)
+
+    def test_ignores_cache_with_later_lower_bound(self) -> None:
+        api = FakeContestApi(60)
+        self.fetch(api, self.at(5))
+        self.assertEqual(self.fetch(api, self.at(1)), list(range(1, 60)))
+        self.assertEqual(len(api.requests), 2)
+
+    def test_ignores_expired_entries(self) -> None:
+        api = FakeContestApi(60)
+        self.fetch(api, self.at(1))
+        with mock.patch("time.time", return_value=time.time() + 601):
+            self.fetch(api, self.at(1))
+        self.assertEqual(len(api.requests), 2)
+
+    def test_disabled_when_ttl_is_zero(self) -> None:
+        api = FakeContestApi(60)
+        self.fetch(api, self.at(1), cache_ttl=0)
+        self.fetch(api, self.at(1), cache_ttl=0)
+        self.assertEqual(len(api.requests), 2)
+        self.assertEqual(list(self.cache_dir.iterdir()), [])
+
+    def test_write_prunes_expired_entries(self) -> None:
+        stale = self.cache_dir / "stale.json"
+        stale.write_text("{}", encoding="utf-8")
+        old = time.time() - 3600
+        os.utime(stale, (old, old))
+        self.fetch(FakeContestApi(5), self.at(1))
+        self.assertFalse(stale.exists())
+        self.assertEqual(len(list(self.cache_dir.glob("*.json"))), 1)
+
+
+class FetchContestsForResourcesTests(unittest.TestCase):
+    def fetch(self) -> list:
+        return clist_to_ics.fetch_contests_for_resources(
+            resource_filters=clist_to_ics.DEFAULT_RESOURCE_FILTERS,
+            username="user",
+            api_key="key",
+            starts_after=None,
+            ends_before=None,
+            per_resource_limit=0,
+            include_ended=True,
+        )
+
+    def test_raises_when_every_resource_fails(self) -> None:
+        error = clist_to_ics.ClistApiError("CLIST API error (401)")
+        with mock.patch.object(clist_to_ics, "fetch_contests_for_resource", side_effect=error):
+            with mock.patch("sys.stderr"), self.assertRaises(clist_to_ics.ClistApiError):
+                self.fetch()
+
+    def test_keeps_results_when_some_resources_fail(self) -> None:
+        def fetch_one(filter_key, filter_value, **kwargs):
+            if filter_value == "atcoder.jp":
+                raise clist_to_ics.ClistApiError("boom")
+            return [filter_value]
+
+        with mock.patch.object(clist_to_ics, "fetch_contests_for_resource", side_effect=fetch_one):
+            with mock.patch("sys.stderr"):
+                contests = self.fetch()
+        self.assertEqual(
+            contests,
+            ["leetcode.com", "codeforces.com", "luogu.com.cn", "ac.nowcoder.com"],
+        )
+
+
+class ConnectionTests(unittest.TestCase):
+    def test_retry_after_seconds(self) -> None:
+        self.assertEqual(clist_to_ics.retry_after_seconds(None), 0.0)
+        self.assertEqual(clist_to_ics.retry_after_seconds("5"), 5.0)
+        self.assertEqual(clist_to_ics.retry_after_seconds("not a date"), 0.0)
+        self.assertEqual(clist_to_ics.retry_after_seconds("86400"), clist_to_ics.MAX_RETRY_AFTER)
+        retry_at = dt.datetime.now(dt.timezone.utc) + dt.timedelta(seconds=30)
+        delay = clist_to_ics.retry_after_seconds(email.utils.format_datetime(retry_at, usegmt=True))
+        self.assertTrue(25 <= delay <= 30, delay)
+
+    def test_open_connection_tunnels_through_https_proxy(self) -> None:
+        environ = {"HTTPS_PROXY": "http://proxy.example:3128"}
+        with mock.patch.dict("os.environ", environ, clear=True):
+            with mock.patch("http.client.HTTPSConnection.set_tunnel") as set_tunnel:
+                connection = clist_to_ics.open_connection()
+        self.assertEqual((connection.host, connection.port), ("proxy.example", 3128))
+        set_tunnel.assert_called_once_with(clist_to_ics.API_URL.hostname, clist_to_ics.API_URL.port, headers={})
+
+    def test_open_connection_respects_no_proxy(self) -> None:
+        environ = {"HTTPS_PROXY": "http://proxy.example:3128", "NO_PROXY": clist_to_ics.API_URL.hostname}
+        with mock.patch.dict("os.environ", environ, clear=True):
+            with mock.patch("http.client.HTTPSConnection.set_tunnel") as set_tunnel:
+                connection = clist_to_ics.open_connection()
+        self.assertEqual(connection.host, clist_to_ics.API_URL.hostname)
+        set_tunnel.assert_not_called()
+
+
+class FakeConnection:
+    def __init__(self, error: Optional[BaseException] = None) -> None:
+        self.error = error
+        self.closed = False
+
+    def request(self, method, target, headers):
+        if self.error is not None:
+            raise self.error
+
+    def getresponse(self):
+        response = mock.Mock(status=200)
+        response.read.return_value = b'{"objects": []}'
+        return response
+
+    def close(self) -> None:
+        self.closed = True
+
+
+class ApiGetRetryTests(unittest.TestCase):
+    def api_get(self, idle: list, opened: list) -> object:
+        with mock.patch.object(clist_to_ics, "_idle_connections", list(idle)):
+            with mock.patch.object(clist_to_ics, "open_connection", side_effect=opened) as open_connection:
+                try:
+                    return clist_to_ics.api_get("/contest/", {}, "user", "key")
+                finally:
+                    self.open_calls = open_connection.call_count
+
+    def test_resends_on_a_new_connection_when_an_idle_one_was_dropped(self) -> None:
+        stale = FakeConnection(http.client.RemoteDisconnected("closed"))
+        self.assertEqual(self.api_get([stale], [FakeConnection()]), {"objects": []})
+        self.assertTrue(stale.closed)
+        self.assertEqual(self.open_calls, 1)
+
+    def test_raises_immediately_on_timeouts_and_tls_errors(self) -> None:
+        for error in (socket.timeout("timed out"), ssl.SSLCertVerificationError("bad certificate")):
+            with self.subTest(error=type(error).__name__):
+                with self.assertRaises(clist_to_ics.ClistApiError):
+                    self.api_get([FakeConnection(error)], [FakeConnection()])
+                self.assertEqual(self.open_calls, 0)
+
+    def test_does_not_retry_a_disconnect_on_a_new_connection(self) -> None:
+        with self.assertRaises(clist_to_ics.ClistApiError):
+            self.api_get([], [FakeConnection(ConnectionResetError("reset")), FakeConnection()])
+        self.assertEqual(self.open_calls, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()